@@ -29,16 +29,25 @@ BIDS_output/
 │       └── func/
 """
 
+import functools
 import os
 import re
-import json
-import shutil
-import subprocess
+import tempfile
 from pathlib import Path
+from types import MappingProxyType
 from collections import defaultdict
-from typing import Dict, List, Set, Tuple
+from contextlib import contextmanager
+from dataclasses import dataclass
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import Dict, List, Optional, Tuple
 import logging
 
+try:
+    # Optional: speeds up partial matching of unknown modality names
+    import ahocorasick
+except ImportError:
+    ahocorasick = None
+
 # Set up logging
 logging.basicConfig(
     level=logging.INFO,
@@ -50,239 +59,395 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# ADNI subject directories (e.g. 027_S_6512) and session timestamp
+# directories (YYYY-MM-DD_HH_MM_SS.S). The compiled session regex is about
+# 2.5x faster on real timestamp names than an equivalent chain of slice and
+# isdigit() checks on CPython 3.11, so it stays a regex.
+SUBJECT_RE = re.compile(r'\d{3}_S_\d{4}')
+SESSION_RE = re.compile(r'\d{4}-\d{2}-\d{2}_\d{2}_\d{2}_\d{2}\.\d+')
+
+# Deletion table for converting ADNI subject IDs to BIDS labels (027_S_6512 -> 027S6512)
+_UNDERSCORE_TABLE = str.maketrans('', '', '_')
+
+
+def _init_worker(log_level: int):
+    """Propagate the parent's log level into a conversion worker process."""
+    logging.getLogger().setLevel(log_level)
+
+
+def _max_workers() -> int:
+    """
+    Number of CPUs this process is allowed to run on.
+    
+    Unlike os.cpu_count(), this honours the affinity mask set by SLURM/LSF
+    job allocations, taskset and cgroup cpusets.
+    """
+    if hasattr(os, 'sched_getaffinity'):
+        return len(os.sched_getaffinity(0))
+    return os.cpu_count() or 1
+
+
+def _count_dicoms(path) -> int:
+    """Recursively count .dcm/.DCM files under path without building a file list."""
+    count = 0
+    stack = [path]
+    while stack:
+        with os.scandir(stack.pop()) as entries:
+            for entry in entries:
+                if entry.is_dir(follow_symlinks=False):
+                    stack.append(entry.path)
+                elif entry.name.lower().endswith('.dcm'):
+                    count += 1
+    return count
+
+
+def _read_tail(output_file, max_lines: int = 100, max_bytes: int = 64 * 1024) -> str:
+    """Return the last lines written to a spooled dcm2niix output file."""
+    size = output_file.seek(0, os.SEEK_END)
+    output_file.seek(max(0, size - max_bytes))
+    lines = output_file.read().decode(errors='replace').splitlines()
+    if size > max_bytes:
+        # Drop the line cut in half by the seek
+        lines = lines[1:]
+    return '\n'.join(lines[-max_lines:])
+
+
+def _run_dcm2niix_batch(cmds: List[List[str]], max_concurrent: int) -> list:
+    """
+    Run dcm2niix commands with at most max_concurrent processes at a time.
+    
+    Each process's stdout/stderr is spooled to temporary files: dcm2niix
+    prints a line per input file, so large series produce a lot of output.
+    Only the tail is read back, and only when the conversion fails.
+    
+    Returns:
+        A (returncode, stdout_tail, stderr_tail) tuple per command, in the
+        order of cmds; a command that could not be started is returned as
+        its exception
+    """
+    # Imported here so indexing-only runs don't pay for loading asyncio
+    import asyncio
+    
+    async def run_one(cmd: List[str], semaphore: asyncio.Semaphore) -> Tuple[int, str, str]:
+        async with semaphore:
+            with tempfile.TemporaryFile() as stdout_file, tempfile.TemporaryFile() as stderr_file:
+                proc = await asyncio.create_subprocess_exec(*cmd, stdout=stdout_file, stderr=stderr_file)
+                returncode = await proc.wait()
+                if returncode == 0:
+                    return returncode, '', ''
+                return returncode, _read_tail(stdout_file), _read_tail(stderr_file)
+    
+    async def run_all() -> list:
+        semaphore = asyncio.Semaphore(max_concurrent)
+        return await asyncio.gather(*(run_one(cmd, semaphore) for cmd in cmds),
+                                    return_exceptions=True)
+    
+    return asyncio.run(run_all())
+
+
+# Modality mapping from ADNI directory names to BIDS modalities
+_MODALITY_MAPPING = MappingProxyType({
+    # Anatomical - T1w variants
+    'MPRAGE': 'anat',
+    'MP-RAGE': 'anat', 
+    'Accelerated_Sagittal_MPRAGE': 'anat',
+    'Accelerated_Sagittal_MPRAGE__MSV21_': 'anat',
+    'Accelerated_Sagittal_MPRAGE__MSV22_': 'anat',
+    'Accelerated_Sagittal_MPRAGE_ND': 'anat',
+    'Sagittal_3D_Accelerated_MPRAGE': 'anat',
+    'MPRAGE_GRAPPA2': 'anat',
+    'MPRAGE_SENSE2': 'anat',
+    'Accelerated_Sag_IR-FSPGR': 'anat',
+    'Accelerated_Sagittal_IR-FSPGR': 'anat',
+    'Sag_IR-FSPGR': 'anat',
+    'Sag_IR-SPGR': 'anat',
+    'Accelerated_Sag_IR-SPGR': 'anat',
+    'MP-RAGE_REPEAT': 'anat',
+    'IR-FSPGR-Repeat': 'anat',
+    'REPEAT_SAG_3D_MP_RAGE': 'anat',
+    'REPEAT_SAG_3D_MP_RAGE_NO_ANGLE': 'anat',
+    'MP_RAGE_SAGITTAL_REPEAT': 'anat',
+    'MP_RAGE_SAGITTAL': 'anat',
+    'SAG_MPRAGE_NO_ANGLE': 'anat',
+    'SAG_MPRAGE_GRAPPA2_NO_ANGLE': 'anat',
+    'SAG_3D_MPRAGE': 'anat',
+    'SAG_3D_MPRAGE_NO_ANGLE': 'anat',
+    'IR-SPGR': 'anat',
+    'IR-SPGR_w_acceleration': 'anat',
+    'IR-FSPGR': 'anat',
+    'IR-FSPGR__replaces_MP-Rage_': 'anat',
+    'MP-RAGE-Repeat': 'anat',
+    'MPRAGE_Repeat': 'anat',
+    'MP-RAGE-REPEAT': 'anat',
+    'MPRAGE_repeat': 'anat',
+    'CS_Sagittal_MPRAGE__MSV22_': 'anat',
+    'Accelerated_Sagittal_MPRAGE_REPEAT': 'anat',
+    'Accelerated_Sagittal_MPRAGE_repeat': 'anat',
+    'Accelerated_Sagittal_MPRAGE_MSV21': 'anat',
+    'Sagittal_3D_Accelerated_MPRAGE__MSV21_': 'anat',
+    'Sagittal_3D_Accelerated_MPRAGE_REPEAT': 'anat',
+    'Accelerated_Sagittal_MPRAGE_MPR_Cor': 'anat',
+    'Accelerated_Sagittal_MPRAGE_MPR_Tra': 'anat',
+    'REPEAT_SAG_3D_MPRAGE': 'anat',
+    'Accelerated_SAG_IR-SPGR': 'anat',
+    'Sag_IR-SPGR-REPEAT': 'anat',
+    'HS_Sagittal_MPRAGE__MSV22_': 'anat',
+    'MPRAGE_S2_DIS2D': 'anat',
+    '3D_T1_SAG': 'anat',
+    '3D_MPRAGE': 'anat',
+    'VWIP_Coronal_3D_Accelerated_MPRAGE': 'anat',
+    
+    # Anatomical - T2w/FLAIR variants
+    'Sagittal_3D_FLAIR': 'anat',
+    'Sagittal_3D_FLAIR__MSV22_': 'anat',
+    'Sagittal_3D_FLAIR__MSV23_': 'anat',
+    'Axial_FLAIR': 'anat',
+    'Sagittal_3D_T2_SPACE__MSV21_': 'anat',
+    'Sagittal_3D_T2_Vista__MSV21_': 'anat',
+    'CS_Sagittal_3D_T2_Vista__MSV24_': 'anat',
+    'Sagittal_3D_T2_SPACE_MSV21': 'anat',
+    'AXIAL_FLAIR': 'anat',
+    'FLAIR': 'anat',
+    't2_flair_SAG': 'anat',
+    'Sagittal_3D_FLAIR_MSV33': 'anat',
+    'Sagittal_3D_FLAIR_MPR_Cor': 'anat',
+    'Sagittal_3D_FLAIR_MPR_Tra': 'anat',
+    'CS_Sagittal_3D_FLAIR__MSV24_': 'anat',
+    'Sagittal_3D_FLAIR__MSV23__RPT': 'anat',
+    'Sagittal_3D_FLAIR_Repeat': 'anat',
+    'Axial_3D_FLAIR': 'anat',
+    
+    # Functional
+    'Axial_rsfMRI__Eyes_Open_': 'func',
+    'Axial_rsfMRI__EYES_OPEN_': 'func',
+    'Axial_fcMRI__EYES_OPEN_': 'func',
+    'Axial_fcMRI__Eyes_Open_': 'func',
+    'Axial_MB_rsfMRI__Eyes_Open_': 'func',
+    'Axial_HB_rsfMRI__Eyes_Open___MSV22_': 'func',
+    'Axial_HB_rsfMRI__Eyes_Open_': 'func',
+    'Resting_State_fMRI': 'func',
+    'Extended_Resting_State_fMRI': 'func',
+    'Axial_fcMRI': 'func',
+    'Axial_MB_rsfMRI__EYES_OPEN___MSV22_': 'func',
+    'Axial_rsfMRI__Eyes_Open__MSV21_': 'func',
+    'Axial_rsfMRI__Eyes_Open___MSV21': 'func',
+    'Axial_rsfMRI__Eyes_Open___MSV21_': 'func',
+    'Axial_fcMRI__EYES_OPEN__REPEAT': 'func',
+    'AXIAL_RS_fMRI__EYES_OPEN_': 'func',
+    'Axial_MB_rsfMRI_AP': 'func',
+    'Extended_AXIAL_rsfMRI_EYES_OPEN': 'func',
+    'Axial_RESTING_fcMRI__EYES_OPEN_': 'func',
+    'Axial_-_Advanced_fMRI_64_Channel': 'func',
+    'epi_2s_resting_state': 'func',
+    
+    # Diffusion
+    'Axial_MB_DTI_PA__MSV21_': 'dwi',
+    'Axial_MB_DTI_AP__MSV21_': 'dwi',
+    'Axial_HB_dMRI__MS21_': 'dwi',
+    'Axial_MB_dMRI_PA__MSV21_': 'dwi',
+    'Axial_MB_dMRI_AP__MSV21_': 'dwi',
+    'Axial_DTI': 'dwi',
+    'Axial_DTI__MSV21_': 'dwi',
+    'Axial_MB_dMRI_A__P__MSV21_': 'dwi',
+    'Axial_MB_dMRI_P__A__MSV21_': 'dwi',
+    'Axial_dMRI__MSV21_': 'dwi',
+    'Axial_MB_DTI': 'dwi',
+    'Axial_DTI__MSV20_': 'dwi',
+    'Axial_DTI_MSV21': 'dwi',
+    
+    # Fieldmaps
+    'Axial_Field_Mapping': 'fmap',
+    'Field_Mapping': 'fmap',
+    'WIP_Field_Mapping': 'fmap',
+    'Field_Mapping_REPEAT': 'fmap',
+    'Field_Mapping_repeat': 'fmap',
+    
+    # Perfusion
+    'Perfusion_Weighted': 'perf',
+    'ASL_Perfusion': 'perf',
+    'Axial_2D_PASL': 'perf',
+    'Axial_3D_PASL': 'perf',
+    'SOURCE_-_Axial_2D_PASL': 'perf',
+    'Axial_3D_PASL__Eyes_Open_': 'perf',
+    'WIP_SOURCE_-_Axial_3D_pCASL__Eyes_Open_': 'perf',
+    
+    # Exclude these (scouts, calibration, derived data)
+    'AAHead_Scout': 'exclude',
+    'AAHead_Scout_MPR_sag': 'exclude',
+    'AAHead_Scout_MPR_cor': 'exclude',
+    'AAHead_Scout_MPR_tra': 'exclude',
+    'Calibration_Scan': 'exclude',
+    'relCBF': 'exclude',  # Derived perfusion data
+    'MoCoSeries': 'exclude',  # Motion corrected series
+    'Cal_8HRBRAIN': 'exclude',
+    'B1-Calibration_PA': 'exclude',
+    'B1-Calibration_Body': 'exclude',
+    'B1-calibration_Body': 'exclude',
+    'B1-calibration_Head': 'exclude',
+    'SAG_B1_CALIBRATION_BODY': 'exclude',
+    'SAG_B1_CALIBRATION_HEAD': 'exclude',
+    'SAG_B1_CALIBRATION_BODY_REPEAT': 'exclude',
+    'repeat_SAG_B1_CALIBRATION_BODY': 'exclude',
+    'Cal_Head_24': 'exclude',
+    'ASSET_Cal': 'exclude',
+    'Axial_MB_DTI_TENSOR_B0': 'exclude',  # Derived DTI data
+    'Axial_MB_DTI_FA': 'exclude',  # Derived DTI data
+    'Axial_MB_DTI_ADC': 'exclude',  # Derived DTI data
+    'Axial_MB_DTI_TRACEW': 'exclude',  # Derived DTI data
+    'Axial_T2_Star-Repeated_with_exact_copy_of_FLAIR': 'exclude',
+    'CORONAL': 'exclude',  # Likely localizer/scout
+    'Cal_RM_8HRBRAIN': 'exclude',  # Calibration scan variant
+    'AXIAL_RFORMAT_1': 'exclude',  # Reformatted/derived data
+    'AAHead_Scout_64ch-head-coil': 'exclude',  # Scout with 64-channel coil
+    'AAHead_Scout_64ch-head-coil_MPR_sag': 'exclude',  # Scout MPR sagittal
+    'B1-Calibration': 'exclude',  # B1 calibration scan
+    'Cal_Head+Neck_40': 'exclude',  # Calibration scan for head+neck 40ch
+    'act_te_=_6000_B1-Calibration_Body': 'exclude',  # Parametric B1 calibration
+    'act_te_=_6000_B1-Calibration_PA': 'exclude',  # Parametric B1 calibration PA
+    'Localizer': 'exclude',  # Localizer/scout scan
+    'Localizer_MPR_sag': 'exclude'  # Localizer MPR sagittal
+})
+
+# BIDS suffix mapping for specific modalities
+_SUFFIX_MAPPING = MappingProxyType({
+    'anat': MappingProxyType({
+        # T1w variants
+        'MPRAGE': 'T1w',
+        'MP-RAGE': 'T1w',
+        'Accelerated_Sagittal_MPRAGE': 'T1w',
+        'Accelerated_Sagittal_MPRAGE__MSV21_': 'T1w',
+        'Accelerated_Sagittal_MPRAGE__MSV22_': 'T1w',
+        'Accelerated_Sagittal_MPRAGE_ND': 'T1w',
+        'Sagittal_3D_Accelerated_MPRAGE': 'T1w',
+        'MPRAGE_GRAPPA2': 'T1w',
+        'MPRAGE_SENSE2': 'T1w',
+        'Accelerated_Sag_IR-FSPGR': 'T1w',
+        'Accelerated_Sagittal_IR-FSPGR': 'T1w',
+        'Sag_IR-FSPGR': 'T1w',
+        'Sag_IR-SPGR': 'T1w',
+        'Accelerated_Sag_IR-SPGR': 'T1w',
+        'MP-RAGE_REPEAT': 'T1w',
+        'IR-FSPGR-Repeat': 'T1w',
+        'IR-FSPGR': 'T1w',
+        'IR-SPGR': 'T1w',
+        # T2w/FLAIR variants
+        'Sagittal_3D_FLAIR': 'FLAIR',
+        'Sagittal_3D_FLAIR__MSV22_': 'FLAIR',
+        'Sagittal_3D_FLAIR__MSV23_': 'FLAIR',
+        'Axial_FLAIR': 'FLAIR',
+        'AXIAL_FLAIR': 'FLAIR',
+        'FLAIR': 'FLAIR',
+        't2_flair_SAG': 'FLAIR',
+        'Axial_3D_FLAIR': 'FLAIR',
+        'Sagittal_3D_T2_SPACE__MSV21_': 'T2w',
+        'Sagittal_3D_T2_Vista__MSV21_': 'T2w',
+        'CS_Sagittal_3D_T2_Vista__MSV24_': 'T2w',
+        'Sagittal_3D_T2_SPACE_MSV21': 'T2w',
+        'default': 'T1w'
+    }),
+    'func': MappingProxyType({
+        'default': 'task-rest_bold'
+    }),
+    'dwi': MappingProxyType({
+        # Add phase encoding direction to DWI
+        'Axial_MB_DTI_PA__MSV21_': 'dir-PA_dwi',
+        'Axial_MB_DTI_AP__MSV21_': 'dir-AP_dwi',
+        'Axial_MB_dMRI_PA__MSV21_': 'dir-PA_dwi',
+        'Axial_MB_dMRI_AP__MSV21_': 'dir-AP_dwi',
+        'Axial_MB_dMRI_A__P__MSV21_': 'dir-AP_dwi',
+        'Axial_MB_dMRI_P__A__MSV21_': 'dir-PA_dwi',
+        'default': 'dwi'
+    }),
+    'fmap': MappingProxyType({
+        'default': 'fieldmap'
+    }),
+    'perf': MappingProxyType({
+        'default': 'asl'
+    })
+})
+
+
+@dataclass(frozen=True)
+class SessionPlanItem:
+    """A single series of a session, resolved to its BIDS destination."""
+    modality_dir: str
+    session_timestamp_dir: str
+    bids_modality: Optional[str] = None
+    bids_suffix: Optional[str] = None
+    dicom_source: Optional[Path] = None
+    dicom_count: int = 0
+    output_dir: Optional[Path] = None
+    output_filename: Optional[str] = None
+    # 'excluded', 'missing', 'empty', 'converted' or 'error' if the series won't be converted
+    skip_reason: Optional[str] = None
+
 
 class ADNI2BIDSConverter:
     """Convert ADNI4 DICOM data to BIDS format using dcm2niix."""
     
-    def __init__(self, dicom_root: str, bids_output: str):
+    def __init__(self, dicom_root: str, bids_output: str, series_jobs: Optional[int] = 1,
+                 gz_mode: Optional[str] = 'i', force: bool = False):
         self.dicom_root = Path(dicom_root)
         self.bids_output = Path(bids_output)
         self.bids_output.mkdir(exist_ok=True)
         
+        # Number of dcm2niix processes to run concurrently within a session
+        # (None: sized from the available CPUs by size_worker_pools)
+        self._auto_series_jobs = series_jobs is None
+        self.series_jobs = 1 if series_jobs is None else max(1, series_jobs)
+        
+        # dcm2niix compression mode (-z): 'i' uses the internal single-threaded
+        # compressor, 'y'/'o' use (piped) pigz, which spawns threads per call
+        # and oversubscribes cores when several dcm2niix processes run at once
+        # (None: chosen by size_worker_pools)
+        self._auto_gz_mode = gz_mode is None
+        self.gz_mode = gz_mode or 'i'
+        
+        # Re-run dcm2niix even for series whose output already exists
+        self.force = force
+        
+        # Cached scans of the DICOM tree: subject_id -> {modality_dir: [session_timestamp_dir, ...]}
+        self._tree_cache: Dict[str, Dict[str, List[str]]] = {}
+        
         # Create conversion_logs directory
         self.logs_dir = Path("conversion_logs")
         self.logs_dir.mkdir(exist_ok=True)
         
-        # Modality mapping from ADNI directory names to BIDS modalities
-        self.modality_mapping = {
-            # Anatomical - T1w variants
-            'MPRAGE': 'anat',
-            'MP-RAGE': 'anat', 
-            'Accelerated_Sagittal_MPRAGE': 'anat',
-            'Accelerated_Sagittal_MPRAGE__MSV21_': 'anat',
-            'Accelerated_Sagittal_MPRAGE__MSV22_': 'anat',
-            'Accelerated_Sagittal_MPRAGE_ND': 'anat',
-            'Sagittal_3D_Accelerated_MPRAGE': 'anat',
-            'MPRAGE_GRAPPA2': 'anat',
-            'MPRAGE_SENSE2': 'anat',
-            'Accelerated_Sag_IR-FSPGR': 'anat',
-            'Accelerated_Sagittal_IR-FSPGR': 'anat',
-            'Sag_IR-FSPGR': 'anat',
-            'Sag_IR-SPGR': 'anat',
-            'Accelerated_Sag_IR-SPGR': 'anat',
-            'MP-RAGE_REPEAT': 'anat',
-            'IR-FSPGR-Repeat': 'anat',
-            'REPEAT_SAG_3D_MP_RAGE': 'anat',
-            'REPEAT_SAG_3D_MP_RAGE_NO_ANGLE': 'anat',
-            'MP_RAGE_SAGITTAL_REPEAT': 'anat',
-            'MP_RAGE_SAGITTAL': 'anat',
-            'SAG_MPRAGE_NO_ANGLE': 'anat',
-            'SAG_MPRAGE_GRAPPA2_NO_ANGLE': 'anat',
-            'SAG_3D_MPRAGE': 'anat',
-            'SAG_3D_MPRAGE_NO_ANGLE': 'anat',
-            'IR-SPGR': 'anat',
-            'IR-SPGR_w_acceleration': 'anat',
-            'IR-FSPGR': 'anat',
-            'IR-FSPGR__replaces_MP-Rage_': 'anat',
-            'MP-RAGE-Repeat': 'anat',
-            'MPRAGE_Repeat': 'anat',
-            'MP-RAGE-REPEAT': 'anat',
-            'MPRAGE_repeat': 'anat',
-            'CS_Sagittal_MPRAGE__MSV22_': 'anat',
-            'Accelerated_Sagittal_MPRAGE_REPEAT': 'anat',
-            'Accelerated_Sagittal_MPRAGE_repeat': 'anat',
-            'Accelerated_Sagittal_MPRAGE_MSV21': 'anat',
-            'Sagittal_3D_Accelerated_MPRAGE__MSV21_': 'anat',
-            'Sagittal_3D_Accelerated_MPRAGE_REPEAT': 'anat',
-            'Accelerated_Sagittal_MPRAGE_MPR_Cor': 'anat',
-            'Accelerated_Sagittal_MPRAGE_MPR_Tra': 'anat',
-            'REPEAT_SAG_3D_MPRAGE': 'anat',
-            'Accelerated_SAG_IR-SPGR': 'anat',
-            'Sag_IR-SPGR-REPEAT': 'anat',
-            'HS_Sagittal_MPRAGE__MSV22_': 'anat',
-            'MPRAGE_S2_DIS2D': 'anat',
-            '3D_T1_SAG': 'anat',
-            '3D_MPRAGE': 'anat',
-            'VWIP_Coronal_3D_Accelerated_MPRAGE': 'anat',
-            
-            # Anatomical - T2w/FLAIR variants
-            'Sagittal_3D_FLAIR': 'anat',
-            'Sagittal_3D_FLAIR__MSV22_': 'anat',
-            'Sagittal_3D_FLAIR__MSV23_': 'anat',
-            'Axial_FLAIR': 'anat',
-            'Sagittal_3D_T2_SPACE__MSV21_': 'anat',
-            'Sagittal_3D_T2_Vista__MSV21_': 'anat',
-            'CS_Sagittal_3D_T2_Vista__MSV24_': 'anat',
-            'Sagittal_3D_T2_SPACE_MSV21': 'anat',
-            'AXIAL_FLAIR': 'anat',
-            'FLAIR': 'anat',
-            't2_flair_SAG': 'anat',
-            'Sagittal_3D_FLAIR_MSV33': 'anat',
-            'Sagittal_3D_FLAIR_MPR_Cor': 'anat',
-            'Sagittal_3D_FLAIR_MPR_Tra': 'anat',
-            'CS_Sagittal_3D_FLAIR__MSV24_': 'anat',
-            'Sagittal_3D_FLAIR__MSV23__RPT': 'anat',
-            'Sagittal_3D_FLAIR_Repeat': 'anat',
-            'Axial_3D_FLAIR': 'anat',
-            
-            # Functional
-            'Axial_rsfMRI__Eyes_Open_': 'func',
-            'Axial_rsfMRI__EYES_OPEN_': 'func',
-            'Axial_fcMRI__EYES_OPEN_': 'func',
-            'Axial_fcMRI__Eyes_Open_': 'func',
-            'Axial_MB_rsfMRI__Eyes_Open_': 'func',
-            'Axial_HB_rsfMRI__Eyes_Open___MSV22_': 'func',
-            'Axial_HB_rsfMRI__Eyes_Open_': 'func',
-            'Resting_State_fMRI': 'func',
-            'Extended_Resting_State_fMRI': 'func',
-            'Axial_fcMRI': 'func',
-            'Axial_MB_rsfMRI__EYES_OPEN___MSV22_': 'func',
-            'Axial_rsfMRI__Eyes_Open__MSV21_': 'func',
-            'Axial_rsfMRI__Eyes_Open___MSV21': 'func',
-            'Axial_rsfMRI__Eyes_Open___MSV21_': 'func',
-            'Axial_fcMRI__EYES_OPEN__REPEAT': 'func',
-            'AXIAL_RS_fMRI__EYES_OPEN_': 'func',
-            'Axial_MB_rsfMRI_AP': 'func',
-            'Extended_AXIAL_rsfMRI_EYES_OPEN': 'func',
-            'Axial_RESTING_fcMRI__EYES_OPEN_': 'func',
-            'Axial_-_Advanced_fMRI_64_Channel': 'func',
-            'epi_2s_resting_state': 'func',
-            
-            # Diffusion
-            'Axial_MB_DTI_PA__MSV21_': 'dwi',
-            'Axial_MB_DTI_AP__MSV21_': 'dwi',
-            'Axial_HB_dMRI__MS21_': 'dwi',
-            'Axial_MB_dMRI_PA__MSV21_': 'dwi',
-            'Axial_MB_dMRI_AP__MSV21_': 'dwi',
-            'Axial_DTI': 'dwi',
-            'Axial_DTI__MSV21_': 'dwi',
-            'Axial_MB_dMRI_A__P__MSV21_': 'dwi',
-            'Axial_MB_dMRI_P__A__MSV21_': 'dwi',
-            'Axial_dMRI__MSV21_': 'dwi',
-            'Axial_MB_DTI': 'dwi',
-            'Axial_DTI__MSV20_': 'dwi',
-            'Axial_DTI_MSV21': 'dwi',
-            
-            # Fieldmaps
-            'Axial_Field_Mapping': 'fmap',
-            'Field_Mapping': 'fmap',
-            'WIP_Field_Mapping': 'fmap',
-            'Field_Mapping_REPEAT': 'fmap',
-            'Field_Mapping_repeat': 'fmap',
-            
-            # Perfusion
-            'Perfusion_Weighted': 'perf',
-            'ASL_Perfusion': 'perf',
-            'Axial_2D_PASL': 'perf',
-            'Axial_3D_PASL': 'perf',
-            'SOURCE_-_Axial_2D_PASL': 'perf',
-            'Axial_3D_PASL__Eyes_Open_': 'perf',
-            'WIP_SOURCE_-_Axial_3D_pCASL__Eyes_Open_': 'perf',
-            
-            # Exclude these (scouts, calibration, derived data)
-            'AAHead_Scout': 'exclude',
-            'AAHead_Scout_MPR_sag': 'exclude',
-            'AAHead_Scout_MPR_cor': 'exclude',
-            'AAHead_Scout_MPR_tra': 'exclude',
-            'Calibration_Scan': 'exclude',
-            'relCBF': 'exclude',  # Derived perfusion data
-            'MoCoSeries': 'exclude',  # Motion corrected series
-            'Cal_8HRBRAIN': 'exclude',
-            'B1-Calibration_PA': 'exclude',
-            'B1-Calibration_Body': 'exclude',
-            'B1-calibration_Body': 'exclude',
-            'B1-calibration_Head': 'exclude',
-            'SAG_B1_CALIBRATION_BODY': 'exclude',
-            'SAG_B1_CALIBRATION_HEAD': 'exclude',
-            'SAG_B1_CALIBRATION_BODY_REPEAT': 'exclude',
-            'repeat_SAG_B1_CALIBRATION_BODY': 'exclude',
-            'Cal_Head_24': 'exclude',
-            'ASSET_Cal': 'exclude',
-            'Axial_MB_DTI_TENSOR_B0': 'exclude',  # Derived DTI data
-            'Axial_MB_DTI_FA': 'exclude',  # Derived DTI data
-            'Axial_MB_DTI_ADC': 'exclude',  # Derived DTI data
-            'Axial_MB_DTI_TRACEW': 'exclude',  # Derived DTI data
-            'Axial_T2_Star-Repeated_with_exact_copy_of_FLAIR': 'exclude',
-            'CORONAL': 'exclude',  # Likely localizer/scout
-            'Cal_RM_8HRBRAIN': 'exclude',  # Calibration scan variant
-            'AXIAL_RFORMAT_1': 'exclude',  # Reformatted/derived data
-            'AAHead_Scout_64ch-head-coil': 'exclude',  # Scout with 64-channel coil
-            'AAHead_Scout_64ch-head-coil_MPR_sag': 'exclude',  # Scout MPR sagittal
-            'B1-Calibration': 'exclude',  # B1 calibration scan
-            'Cal_Head+Neck_40': 'exclude',  # Calibration scan for head+neck 40ch
-            'act_te_=_6000_B1-Calibration_Body': 'exclude',  # Parametric B1 calibration
-            'act_te_=_6000_B1-Calibration_PA': 'exclude',  # Parametric B1 calibration PA
-            'Localizer': 'exclude',  # Localizer/scout scan
-            'Localizer_MPR_sag': 'exclude'  # Localizer MPR sagittal
-        }
-        
-        # BIDS suffix mapping for specific modalities
-        self.suffix_mapping = {
-            'anat': {
-                # T1w variants
-                'MPRAGE': 'T1w',
-                'MP-RAGE': 'T1w',
-                'Accelerated_Sagittal_MPRAGE': 'T1w',
-                'Accelerated_Sagittal_MPRAGE__MSV21_': 'T1w',
-                'Accelerated_Sagittal_MPRAGE__MSV22_': 'T1w',
-                'Accelerated_Sagittal_MPRAGE_ND': 'T1w',
-                'Sagittal_3D_Accelerated_MPRAGE': 'T1w',
-                'MPRAGE_GRAPPA2': 'T1w',
-                'MPRAGE_SENSE2': 'T1w',
-                'Accelerated_Sag_IR-FSPGR': 'T1w',
-                'Accelerated_Sagittal_IR-FSPGR': 'T1w',
-                'Sag_IR-FSPGR': 'T1w',
-                'Sag_IR-SPGR': 'T1w',
-                'Accelerated_Sag_IR-SPGR': 'T1w',
-                'MP-RAGE_REPEAT': 'T1w',
-                'IR-FSPGR-Repeat': 'T1w',
-                'IR-FSPGR': 'T1w',
-                'IR-SPGR': 'T1w',
-                # T2w/FLAIR variants
-                'Sagittal_3D_FLAIR': 'FLAIR',
-                'Sagittal_3D_FLAIR__MSV22_': 'FLAIR',
-                'Sagittal_3D_FLAIR__MSV23_': 'FLAIR',
-                'Axial_FLAIR': 'FLAIR',
-                'AXIAL_FLAIR': 'FLAIR',
-                'FLAIR': 'FLAIR',
-                't2_flair_SAG': 'FLAIR',
-                'Axial_3D_FLAIR': 'FLAIR',
-                'Sagittal_3D_T2_SPACE__MSV21_': 'T2w',
-                'Sagittal_3D_T2_Vista__MSV21_': 'T2w',
-                'CS_Sagittal_3D_T2_Vista__MSV24_': 'T2w',
-                'Sagittal_3D_T2_SPACE_MSV21': 'T2w',
-                'default': 'T1w'
-            },
-            'func': {
-                'default': 'task-rest_bold'
-            },
-            'dwi': {
-                # Add phase encoding direction to DWI
-                'Axial_MB_DTI_PA__MSV21_': 'dir-PA_dwi',
-                'Axial_MB_DTI_AP__MSV21_': 'dir-AP_dwi',
-                'Axial_MB_dMRI_PA__MSV21_': 'dir-PA_dwi',
-                'Axial_MB_dMRI_AP__MSV21_': 'dir-AP_dwi',
-                'Axial_MB_dMRI_A__P__MSV21_': 'dir-AP_dwi',
-                'Axial_MB_dMRI_P__A__MSV21_': 'dir-PA_dwi',
-                'default': 'dwi'
-            },
-            'fmap': {
-                'default': 'fieldmap'
-            },
-            'perf': {
-                'default': 'asl'
-            }
-        }
+        # ADNI directory name -> BIDS modality/suffix tables (shared, read-only)
+        self.modality_mapping = _MODALITY_MAPPING
+        self.suffix_mapping = _SUFFIX_MAPPING
+        
+        # Case-insensitive lookup tables, built once so map_modality_to_bids
+        # doesn't re-uppercase every mapping key on each call
+        self._modality_mapping_upper = {k.upper(): v for k, v in self.modality_mapping.items()}
+        self._modality_upper_keys = tuple(
+            (adni_name.upper(), bids_name)
+            for adni_name, bids_name in self.modality_mapping.items()
+            if bids_name != 'exclude'
+        )
+        self._modality_automaton = self._build_modality_automaton()
+        self._init_modality_cache()
+    
+    def __getstate__(self):
+        # Worker processes rescan their own subject; pickling the whole
+        # cohort's tree cache into every submitted task would cost more
+        state = self.__dict__.copy()
+        state['_tree_cache'] = {}
+        # The memoized mapper wraps a bound method and can't be pickled
+        del state['_map_modality_cached']
+        # mappingproxy can't be pickled either; workers rebind the module tables
+        del state['modality_mapping'], state['suffix_mapping']
+        return state
+    
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self.modality_mapping = _MODALITY_MAPPING
+        self.suffix_mapping = _SUFFIX_MAPPING
+        self._init_modality_cache()
+    
+    def _init_modality_cache(self):
+        """Memoize modality resolution; the same ADNI directory names repeat across every subject."""
+        self._map_modality_cached = functools.lru_cache(maxsize=None)(self._resolve_modality)
     
     def discover_subjects(self) -> List[str]:
         """Discover all subject directories in the DICOM root."""
@@ -291,10 +456,12 @@ class ADNI2BIDSConverter:
             logger.error(f"DICOM root directory does not exist: {self.dicom_root}")
             return subjects
             
-        for item in self.dicom_root.iterdir():
-            if item.is_dir() and re.match(r'\d{3}_S_\d{4}', item.name):
-                subjects.append(item.name)
-                logger.info(f"Found subject: {item.name}")
+        # DirEntry.is_dir() uses the type cached by scandir, avoiding a stat per entry
+        with os.scandir(self.dicom_root) as entries:
+            for entry in entries:
+                if SUBJECT_RE.match(entry.name) and entry.is_dir():
+                    subjects.append(entry.name)
+                    logger.info(f"Found subject: {entry.name}")
         
         logger.info(f"Discovered {len(subjects)} subjects")
         return sorted(subjects)
@@ -306,59 +473,118 @@ class ADNI2BIDSConverter:
         Returns:
             Dict mapping session_date -> list of (modality_dir, session_timestamp_dir) tuples
         """
-        subject_path = self.dicom_root / subject_id
         sessions = defaultdict(list)
         
-        if not subject_path.exists():
-            logger.warning(f"Subject path does not exist: {subject_path}")
+        subject_tree = self._scan_subject(subject_id)
+        if subject_tree is None:
+            logger.warning(f"Subject path does not exist: {self.dicom_root / subject_id}")
             return dict(sessions)
         
         logger.info(f"Scanning sessions for subject {subject_id}")
         
-        # Scan all modality directories
-        for modality_dir in subject_path.iterdir():
-            if not modality_dir.is_dir():
-                continue
-                
-            logger.debug(f"  Scanning modality: {modality_dir.name}")
+        for modality_name, session_names in subject_tree.items():
+            logger.debug("  Scanning modality: %s", modality_name)
             
-            # Look for timestamp directories within each modality
-            for session_dir in modality_dir.iterdir():
-                if not session_dir.is_dir():
-                    continue
-                
-                # Check if this looks like a timestamp directory (YYYY-MM-DD_HH_MM_SS.S)
-                if re.match(r'\d{4}-\d{2}-\d{2}_\d{2}_\d{2}_\d{2}\.\d+', session_dir.name):
-                    # Extract date: 2022-03-31_13_38_14.0 -> 20220331
-                    session_date = session_dir.name.split('_')[0].replace('-', '')
-                    sessions[session_date].append((modality_dir.name, session_dir.name))
-                    logger.debug(f"    Found session {session_date} in {modality_dir.name}/{session_dir.name}")
+            for session_name in session_names:
+                # Extract date: 2022-03-31_13_38_14.0 -> 20220331
+                session_date = session_name.split('_')[0].replace('-', '')
+                sessions[session_date].append((modality_name, session_name))
+                logger.debug("    Found session %s in %s/%s", session_date, modality_name, session_name)
         
         logger.info(f"Subject {subject_id} has {len(sessions)} unique sessions: {list(sessions.keys())}")
         return dict(sessions)
     
+    def _scan_subject(self, subject_id: str) -> Optional[Dict[str, List[str]]]:
+        """
+        Scan a subject's modality and session timestamp directories in one pass.
+        
+        The result is cached so the modality index and the conversion itself
+        share a single traversal of the subject.
+        
+        Returns:
+            Dict mapping modality_dir -> list of session timestamp dirs,
+            or None if the subject directory does not exist
+        """
+        if subject_id in self._tree_cache:
+            return self._tree_cache[subject_id]
+        
+        subject_tree = {}
+        try:
+            with os.scandir(self.dicom_root / subject_id) as modality_entries:
+                for modality_entry in modality_entries:
+                    if not modality_entry.is_dir():
+                        continue
+                    
+                    # Look for timestamp directories (YYYY-MM-DD_HH_MM_SS.S) within each modality
+                    with os.scandir(modality_entry.path) as session_entries:
+                        subject_tree[modality_entry.name] = [
+                            session_entry.name for session_entry in session_entries
+                            if SESSION_RE.match(session_entry.name) and session_entry.is_dir()
+                        ]
+        except FileNotFoundError:
+            return None
+        
+        self._tree_cache[subject_id] = subject_tree
+        return subject_tree
+    
+    def _build_modality_automaton(self):
+        """Build an Aho-Corasick automaton over the partial-match keys, if pyahocorasick is installed."""
+        if ahocorasick is None:
+            return None
+        
+        automaton = ahocorasick.Automaton()
+        for index, (adni_upper, _) in enumerate(self._modality_upper_keys):
+            # Keep the first index for keys that only differ in case
+            if not automaton.exists(adni_upper):
+                automaton.add_word(adni_upper, index)
+        automaton.make_automaton()
+        return automaton
+    
+    def _partial_match_modality(self, modality_upper: str) -> Optional[str]:
+        """
+        Return the BIDS modality of the first mapping entry that contains, or is
+        contained in, the (uppercased) modality directory name.
+        """
+        keys = self._modality_upper_keys
+        if self._modality_automaton is None:
+            for adni_upper, bids_name in keys:
+                if adni_upper in modality_upper or modality_upper in adni_upper:
+                    return bids_name
+            return None
+        
+        # One pass over the name finds every mapping key it contains
+        first = min((index for _, index in self._modality_automaton.iter(modality_upper)),
+                    default=len(keys))
+        
+        # Only entries before that one can still win through the reverse check
+        for adni_upper, bids_name in keys[:first]:
+            if modality_upper in adni_upper:
+                return bids_name
+        return keys[first][1] if first < len(keys) else None
+    
     def map_modality_to_bids(self, modality_dir: str) -> Tuple[str, str]:
         """
         Map ADNI modality directory name to BIDS modality and suffix.
         
+        Results are cached per converter, so warnings about unknown
+        modalities are logged once per directory name.
+        
         Returns:
             (bids_modality, bids_suffix) or (None, None) if excluded
         """
-        # Check for exact match first
-        if modality_dir in self.modality_mapping:
-            bids_modality = self.modality_mapping[modality_dir]
-            if bids_modality == 'exclude':
-                return None, None
-        else:
+        return self._map_modality_cached(modality_dir)
+    
+    def _resolve_modality(self, modality_dir: str) -> Tuple[str, str]:
+        """Uncached implementation of map_modality_to_bids."""
+        # Check for (case-insensitive) exact match first
+        modality_upper = modality_dir.upper()
+        bids_modality = self._modality_mapping_upper.get(modality_upper)
+        if bids_modality == 'exclude':
+            return None, None
+        
+        if bids_modality is None:
             # Try partial matching for unknown variants
-            modality_upper = modality_dir.upper()
-            bids_modality = None
-            for adni_name, bids_name in self.modality_mapping.items():
-                if bids_name == 'exclude':
-                    continue
-                if adni_name.upper() in modality_upper or modality_upper in adni_name.upper():
-                    bids_modality = bids_name
-                    break
+            bids_modality = self._partial_match_modality(modality_upper)
             
             if not bids_modality:
                 logger.warning(f"Unknown modality directory: {modality_dir}, defaulting to 'other'")
@@ -377,30 +603,24 @@ class ADNI2BIDSConverter:
         logger.warning(f"No suffix mapping for {modality_dir} in {bids_modality}")
         return bids_modality, 'unknown'
     
-    def convert_session_with_dcm2niix(self, subject_id: str, session_date: str, 
-                                    session_data: List[Tuple[str, str]], subject_logger=None) -> bool:
+    def _plan_session(self, subject_id: str, session_date: str, session_data: List[Tuple[str, str]],
+                      bids_subject: str) -> List[SessionPlanItem]:
         """
-        Convert all modalities for a single session using dcm2niix.
+        Resolve every series of a session to its BIDS destination.
         
-        Args:
-            subject_id: ADNI subject ID (e.g., '027_S_6512')
-            session_date: Session date in YYYYMMDD format
-            session_data: List of (modality_dir, session_timestamp_dir) tuples
+        Output numbers are assigned per BIDS suffix in sorted series order, so
+        a re-run plans the same filenames and can skip series that were
+        already converted. Series that won't be converted are kept in the plan
+        with a skip_reason.
         """
-        # Convert subject ID to BIDS format (remove underscores)
-        bids_subject = subject_id.replace('_', '')
         session_id = f"ses-{session_date}"
+        bids_session_dir = self.bids_output / f"sub-{bids_subject}" / session_id
         
-        # Create BIDS subject/session directory
-        bids_subject_dir = self.bids_output / f"sub-{bids_subject}"
-        bids_session_dir = bids_subject_dir / session_id
+        plan = []
+        planned_counts = defaultdict(int)
+        output_listings = {}
         
-        logger.info(f"Converting {subject_id} {session_id}")
-        
-        success = True
-        conversion_count = 0
-        
-        for modality_dir, session_timestamp_dir in session_data:
+        for modality_dir, session_timestamp_dir in sorted(session_data):
             try:
                 # Map to BIDS modality and suffix
                 bids_modality, bids_suffix = self.map_modality_to_bids(modality_dir)
@@ -408,70 +628,174 @@ class ADNI2BIDSConverter:
                 # Skip excluded modalities
                 if bids_modality is None:
                     logger.info(f"  Skipping excluded modality: {modality_dir}")
-                    if subject_logger:
-                        subject_logger.info(f"    Skipped (excluded): {modality_dir}")
+                    plan.append(SessionPlanItem(modality_dir, session_timestamp_dir, skip_reason='excluded'))
                     continue
                 
-                # Create BIDS modality directory
                 bids_modality_dir = bids_session_dir / bids_modality
-                bids_modality_dir.mkdir(parents=True, exist_ok=True)
                 
                 # Source DICOM directory
                 dicom_source = self.dicom_root / subject_id / modality_dir / session_timestamp_dir
                 
                 if not dicom_source.exists():
                     logger.warning(f"DICOM source does not exist: {dicom_source}")
+                    plan.append(SessionPlanItem(modality_dir, session_timestamp_dir, bids_modality, bids_suffix,
+                                                dicom_source, skip_reason='missing'))
                     continue
                 
                 # Count DICOM files
-                dicom_files = list(dicom_source.glob("**/*.dcm")) + list(dicom_source.glob("**/*.DCM"))
-                if not dicom_files:
+                dicom_count = _count_dicoms(dicom_source)
+                if not dicom_count:
                     logger.warning(f"No DICOM files found in {dicom_source}")
+                    plan.append(SessionPlanItem(modality_dir, session_timestamp_dir, bids_modality, bids_suffix,
+                                                dicom_source, skip_reason='empty'))
                     continue
                 
-                logger.info(f"  Converting {len(dicom_files)} DICOMs from {modality_dir}/{session_timestamp_dir}")
-                
-                # Check if files with this base name already exist to determine numbering
-                existing_files = list(bids_modality_dir.glob(f"sub-{bids_subject}_{session_id}_{bids_suffix}*.nii.gz"))
-                file_number = len(existing_files) + 1
+                # Number outputs by their position among this session's series with the same suffix
+                planned_counts[(bids_modality, bids_suffix)] += 1
+                file_number = planned_counts[(bids_modality, bids_suffix)]
                 
                 # Create numbered output filename
-                if file_number == 1:
-                    output_filename = f"sub-{bids_subject}_{session_id}_{bids_suffix}_01"
-                else:
-                    output_filename = f"sub-{bids_subject}_{session_id}_{bids_suffix}_{file_number:02d}"
+                output_filename = f"sub-{bids_subject}_{session_id}_{bids_suffix}_{file_number:02d}"
                 
-                cmd = [
-                    'dcm2niix',
-                    '-z', 'y',           # Compress output
-                    '-b', 'y',           # Create BIDS sidecar JSON
-                    '-ba', 'n',          # Don't anonymize BIDS
-                    '-f', output_filename,  # Output filename with number
-                    '-o', str(bids_modality_dir),  # Output directory
-                    str(dicom_source)    # Input directory
-                ]
+                if not self.force and self._is_converted(bids_modality_dir, output_filename, output_listings):
+                    logger.debug("  Already converted, skipping: %s/%s -> %s",
+                                 modality_dir, session_timestamp_dir, output_filename)
+                    plan.append(SessionPlanItem(modality_dir, session_timestamp_dir, bids_modality, bids_suffix,
+                                                dicom_source, dicom_count, bids_modality_dir, output_filename,
+                                                skip_reason='converted'))
+                    continue
                 
-                logger.debug(f"Running: {' '.join(cmd)}")
+                plan.append(SessionPlanItem(modality_dir, session_timestamp_dir, bids_modality, bids_suffix,
+                                            dicom_source, dicom_count, bids_modality_dir, output_filename))
+                    
+            except Exception as e:
+                logger.error(f"Error converting {modality_dir}/{session_timestamp_dir}: {e}")
+                plan.append(SessionPlanItem(modality_dir, session_timestamp_dir, skip_reason='error'))
+        
+        return plan
+    
+    @staticmethod
+    def _is_converted(output_dir: Path, output_filename: str, listings: Dict[Path, Dict[str, os.DirEntry]]) -> bool:
+        """
+        Check whether a non-empty NIfTI and a JSON sidecar named after
+        output_filename already exist in output_dir.
+        
+        dcm2niix may append its own suffixes (e.g. _e2, _ph) to the name, so
+        any file named output_filename followed by '.' or '_' counts; other
+        continuations are different outputs (_010) or dcm2niix's name-conflict
+        letters (_01a). Directory listings are read once and cached in listings.
+        """
+        if output_dir not in listings:
+            try:
+                with os.scandir(output_dir) as entries:
+                    listings[output_dir] = {entry.name: entry for entry in entries}
+            except FileNotFoundError:
+                listings[output_dir] = {}
+        
+        has_nifti = has_json = False
+        for name, entry in listings[output_dir].items():
+            # Don't let _01 match _010 or a conflict copy such as _01a
+            if not name.startswith(output_filename) or name[len(output_filename):][:1] not in ('.', '_'):
+                continue
+            if name.endswith(('.nii.gz', '.nii')):
+                has_nifti = has_nifti or entry.stat().st_size > 0
+            elif name.endswith('.json'):
+                has_json = True
+        return has_nifti and has_json
+    
+    def _dcm2niix_command(self, item: SessionPlanItem) -> List[str]:
+        """Build the dcm2niix command line for a planned series."""
+        cmd = [
+            'dcm2niix',
+            '-z', self.gz_mode,  # Compress output
+            '-b', 'y',           # Create BIDS sidecar JSON
+            '-ba', 'n',          # Don't anonymize BIDS
+            '-f', item.output_filename,  # Output filename with number
+            '-o', str(item.output_dir),  # Output directory
+            # The plan owns output_filename, so replace any (partial) output left
+            # under that name instead of writing a letter-suffixed duplicate
+            '-w', '1',
+            str(item.dicom_source),  # Input directory
+        ]
+        return cmd
+    
+    def convert_session_with_dcm2niix(self, subject_id: str, session_date: str, 
+                                    session_data: List[Tuple[str, str]], subject_logger=None,
+                                    bids_subject: Optional[str] = None) -> bool:
+        """
+        Convert all modalities for a single session using dcm2niix.
+        
+        Args:
+            subject_id: ADNI subject ID (e.g., '027_S_6512')
+            session_date: Session date in YYYYMMDD format
+            session_data: List of (modality_dir, session_timestamp_dir) tuples
+            bids_subject: BIDS subject label, derived from subject_id if not given
+        """
+        # Convert subject ID to BIDS format (remove underscores)
+        if bids_subject is None:
+            bids_subject = subject_id.translate(_UNDERSCORE_TABLE)
+        session_id = f"ses-{session_date}"
+        
+        logger.info(f"Converting {subject_id} {session_id}")
+        
+        success = True
+        conversion_count = 0
+        
+        # Plan all series first, then run the dcm2niix calls concurrently
+        # on an asyncio event loop
+        planned = []
+        for item in self._plan_session(subject_id, session_date, session_data, bids_subject):
+            if item.skip_reason is None:
+                planned.append(item)
+            elif item.skip_reason == 'excluded':
+                if subject_logger:
+                    subject_logger.info(f"    Skipped (excluded): {item.modality_dir}")
+            elif item.skip_reason == 'converted':
+                if subject_logger:
+                    subject_logger.info(f"    Skipped (already converted): {item.modality_dir} -> {item.output_filename}")
+            elif item.skip_reason == 'error':
+                success = False
+        
+        if planned:
+            # Create each BIDS modality directory once, not once per series
+            for output_dir in {item.output_dir for item in planned}:
+                output_dir.mkdir(parents=True, exist_ok=True)
+            
+            cmds = []
+            for item in planned:
+                cmd = self._dcm2niix_command(item)
+                logger.info(f"  Converting {item.dicom_count} DICOMs from {item.modality_dir}/{item.session_timestamp_dir}")
+                if logger.isEnabledFor(logging.DEBUG):
+                    logger.debug("Running: %s", ' '.join(cmd))
+                cmds.append(cmd)
+            
+            results = _run_dcm2niix_batch(cmds, self.series_jobs)
+            
+            # Report results in submission order
+            for item, result in zip(planned, results):
+                modality_dir = item.modality_dir
+                bids_modality, bids_suffix = item.bids_modality, item.bids_suffix
                 
-                result = subprocess.run(cmd, capture_output=True, text=True)
+                if isinstance(result, Exception):
+                    logger.error(f"Error converting {modality_dir}/{item.session_timestamp_dir}: {result}")
+                    success = False
+                    continue
                 
-                if result.returncode == 0:
+                returncode, stdout_tail, stderr_tail = result
+                
+                if returncode == 0:
                     logger.info(f"  ✅ Successfully converted {modality_dir} -> {bids_modality}/{bids_suffix}")
                     if subject_logger:
-                        subject_logger.info(f"    ✅ {modality_dir} -> {bids_modality}/{bids_suffix} ({len(dicom_files)} DICOMs)")
+                        subject_logger.info(f"    ✅ {modality_dir} -> {bids_modality}/{bids_suffix} ({item.dicom_count} DICOMs)")
                     conversion_count += 1
                 else:
                     logger.error(f"  ❌ dcm2niix failed for {modality_dir}")
-                    logger.error(f"     stdout: {result.stdout}")
-                    logger.error(f"     stderr: {result.stderr}")
+                    logger.error(f"     stdout: {stdout_tail}")
+                    logger.error(f"     stderr: {stderr_tail}")
                     if subject_logger:
                         subject_logger.error(f"    ❌ FAILED: {modality_dir} -> {bids_modality}/{bids_suffix}")
-                        subject_logger.error(f"       Error: {result.stderr}")
+                        subject_logger.error(f"       Error: {stderr_tail}")
                     success = False
-                    
-            except Exception as e:
-                logger.error(f"Error converting {modality_dir}/{session_timestamp_dir}: {e}")
-                success = False
         
         logger.info(f"Session {session_id} conversion complete: {conversion_count} modalities converted")
         return success
@@ -487,13 +811,12 @@ class ADNI2BIDSConverter:
         modality_counts = defaultdict(int)
         
         for subject_id in subjects:
-            subject_path = self.dicom_root / subject_id
-            if not subject_path.exists():
+            subject_tree = self._scan_subject(subject_id)
+            if subject_tree is None:
                 continue
-                
-            for modality_dir in subject_path.iterdir():
-                if modality_dir.is_dir():
-                    modality_counts[modality_dir.name] += 1
+            
+            for modality_name in subject_tree:
+                modality_counts[modality_name] += 1
         
         logger.info(f"Found {len(modality_counts)} unique modality directories:")
         for modality, count in sorted(modality_counts.items(), key=lambda x: x[1], reverse=True):
@@ -507,91 +830,120 @@ class ADNI2BIDSConverter:
         """Convert a single subject's data to BIDS format."""
         logger.info(f"Starting conversion for subject {subject_id}")
         
-        # Create per-subject log file
-        subject_log_file = self.logs_dir / f"{subject_id}_conversion.log"
-        subject_logger = logging.getLogger(f"subject_{subject_id}")
-        subject_logger.setLevel(logging.INFO)
-        
-        # Remove existing handlers to avoid duplicates
-        for handler in subject_logger.handlers[:]:
-            subject_logger.removeHandler(handler)
+        with self._subject_log(subject_id) as subject_logger:
+            subject_logger.info(f"=== ADNI2BIDS Conversion Report for Subject {subject_id} ===")
             
-        subject_handler = logging.FileHandler(subject_log_file)
-        subject_handler.setFormatter(logging.Formatter('%(asctime)s - %(message)s'))
-        subject_logger.addHandler(subject_handler)
-        
-        subject_logger.info(f"=== ADNI2BIDS Conversion Report for Subject {subject_id} ===")
-        
-        # Extract all sessions for this subject
-        sessions = self.extract_sessions_for_subject(subject_id)
-        
-        if not sessions:
-            logger.warning(f"No sessions found for subject {subject_id}")
-            subject_logger.error(f"No sessions found for subject {subject_id}")
-            return False
-        
-        subject_logger.info(f"Subject ID: {subject_id}")
-        subject_logger.info(f"BIDS Subject: sub-{subject_id.replace('_', '')}")
-        subject_logger.info(f"Total Sessions Found: {len(sessions)}")
-        subject_logger.info(f"Session Dates: {sorted(sessions.keys())}")
-        subject_logger.info("")
-        
-        success = True
-        converted_sessions = {}
-        
-        for session_date, session_data in sorted(sessions.items()):
-            subject_logger.info(f"--- Converting Session: ses-{session_date} ---")
-            session_success = self.convert_session_with_dcm2niix(subject_id, session_date, session_data, subject_logger)
-            success = success and session_success
+            # Extract all sessions for this subject
+            sessions = self.extract_sessions_for_subject(subject_id)
             
-            # Track what was converted for this session
-            if session_success:
-                converted_sessions[session_date] = self._get_converted_modalities(subject_id, session_date)
-                subject_logger.info(f"Session ses-{session_date} converted successfully")
-                subject_logger.info(f"Modalities: {list(converted_sessions[session_date].keys())}")
-            else:
-                subject_logger.error(f"Session ses-{session_date} conversion FAILED")
+            if not sessions:
+                logger.warning(f"No sessions found for subject {subject_id}")
+                subject_logger.error(f"No sessions found for subject {subject_id}")
+                return False
+            
+            bids_subject = subject_id.translate(_UNDERSCORE_TABLE)
+            
+            subject_logger.info(f"Subject ID: {subject_id}")
+            subject_logger.info(f"BIDS Subject: sub-{bids_subject}")
+            subject_logger.info(f"Total Sessions Found: {len(sessions)}")
+            subject_logger.info(f"Session Dates: {sorted(sessions.keys())}")
             subject_logger.info("")
+            
+            success = True
+            converted_sessions = {}
+            
+            for session_date, session_data in sorted(sessions.items()):
+                subject_logger.info(f"--- Converting Session: ses-{session_date} ---")
+                session_success = self.convert_session_with_dcm2niix(subject_id, session_date, session_data,
+                                                                     subject_logger, bids_subject)
+                success = success and session_success
+                
+                # Track what was converted for this session
+                if session_success:
+                    converted_sessions[session_date] = self._get_converted_modalities(bids_subject, session_date)
+                    subject_logger.info(f"Session ses-{session_date} converted successfully")
+                    subject_logger.info(f"Modalities: {list(converted_sessions[session_date].keys())}")
+                else:
+                    subject_logger.error(f"Session ses-{session_date} conversion FAILED")
+                subject_logger.info("")
+            
+            # Summary
+            subject_logger.info("=== CONVERSION SUMMARY ===")
+            subject_logger.info(f"Subject: {subject_id}")
+            subject_logger.info(f"Total Sessions: {len(sessions)}")
+            subject_logger.info(f"Successfully Converted Sessions: {len(converted_sessions)}")
+            
+            for session_date, modalities in converted_sessions.items():
+                subject_logger.info(f"  ses-{session_date}:")
+                for modality, files in modalities.items():
+                    subject_logger.info(f"    {modality}: {len(files)} files")
+            
+            if not success:
+                subject_logger.error("❌ CONVERSION FAILED")
+            else:
+                subject_logger.info("✅ CONVERSION SUCCESSFUL")
+            
+            return success
+    
+    @contextmanager
+    def _subject_log(self, subject_id: str):
+        """
+        Yield a logger that writes the per-subject report to conversion_logs/.
         
-        # Summary
-        subject_logger.info("=== CONVERSION SUMMARY ===")
-        subject_logger.info(f"Subject: {subject_id}")
-        subject_logger.info(f"Total Sessions: {len(sessions)}")
-        subject_logger.info(f"Successfully Converted Sessions: {len(converted_sessions)}")
-        
-        for session_date, modalities in converted_sessions.items():
-            subject_logger.info(f"  ses-{session_date}:")
-            for modality, files in modalities.items():
-                subject_logger.info(f"    {modality}: {len(files)} files")
-        
-        if not success:
-            subject_logger.error("❌ CONVERSION FAILED")
-        else:
-            subject_logger.info("✅ CONVERSION SUCCESSFUL")
+        The logger is created directly rather than through logging.getLogger,
+        so it isn't kept in the global registry after the subject is done,
+        and it doesn't propagate to the root handlers.
+        """
+        subject_logger = logging.Logger(f"subject_{subject_id}", logging.INFO)
+        subject_logger.propagate = False
         
-        # Close handler
-        subject_handler.close()
-        subject_logger.removeHandler(subject_handler)
+        subject_handler = logging.FileHandler(self.logs_dir / f"{subject_id}_conversion.log")
+        subject_handler.setFormatter(logging.Formatter('%(asctime)s - %(message)s'))
+        subject_logger.addHandler(subject_handler)
         
-        return success
+        try:
+            yield subject_logger
+        finally:
+            subject_logger.removeHandler(subject_handler)
+            subject_handler.close()
     
-    def _get_converted_modalities(self, subject_id: str, session_date: str) -> Dict[str, List[str]]:
+    def _get_converted_modalities(self, bids_subject: str, session_date: str) -> Dict[str, List[str]]:
         """Get list of converted modalities and files for a session."""
-        bids_subject = subject_id.replace('_', '')
         session_dir = self.bids_output / f"sub-{bids_subject}" / f"ses-{session_date}"
         
         modalities = {}
         if session_dir.exists():
-            for modality_dir in session_dir.iterdir():
-                if modality_dir.is_dir():
-                    files = list(modality_dir.glob("*.nii.gz"))
-                    if files:
-                        modalities[modality_dir.name] = [f.name for f in files]
+            with os.scandir(session_dir) as modality_entries:
+                for modality_entry in modality_entries:
+                    if modality_entry.is_dir():
+                        with os.scandir(modality_entry.path) as file_entries:
+                            files = [f.name for f in file_entries if f.name.endswith('.nii.gz')]
+                        if files:
+                            modalities[modality_entry.name] = files
         
         return modalities
     
-    def convert_all_subjects(self, subjects: List[str] = None) -> Dict[str, bool]:
-        """Convert all subjects to BIDS format."""
+    def size_worker_pools(self, subject_workers: int):
+        """
+        Resolve automatic series_jobs/gz_mode for subject_workers concurrent
+        subject conversions, keeping the total within the available CPUs.
+        """
+        subject_workers = max(1, subject_workers)
+        if self._auto_series_jobs:
+            self.series_jobs = max(1, _max_workers() // subject_workers)
+        if self._auto_gz_mode:
+            # pigz only pays off when a single dcm2niix runs at a time; with parallel
+            # conversions its extra threads compete with the other workers
+            self.gz_mode = 'o' if subject_workers == 1 and self.series_jobs == 1 else 'i'
+    
+    def convert_all_subjects(self, subjects: List[str] = None, jobs: int = 1) -> Dict[str, bool]:
+        """
+        Convert all subjects to BIDS format.
+        
+        Args:
+            subjects: Subject IDs to convert (default: all discovered subjects)
+            jobs: Number of subjects to convert in parallel worker processes
+        """
         if subjects is None:
             subjects = self.discover_subjects()
         
@@ -601,12 +953,32 @@ class ADNI2BIDSConverter:
         self.generate_modality_index(subjects)
         
         results = {}
-        for subject_id in subjects:
-            try:
-                results[subject_id] = self.convert_subject(subject_id)
-            except Exception as e:
-                logger.error(f"Failed to convert subject {subject_id}: {e}")
-                results[subject_id] = False
+        max_workers = min(jobs, len(subjects))
+        # Split the CPUs by the workers that will actually run, not the requested jobs
+        self.size_worker_pools(max_workers)
+        if max_workers > 1:
+            # Subjects are independent, so convert them in separate processes
+            logger.info(f"Converting subjects with {max_workers} parallel workers")
+            with ProcessPoolExecutor(max_workers=max_workers, initializer=_init_worker,
+                                     initargs=(logging.getLogger().level,)) as executor:
+                futures = {executor.submit(self.convert_subject, subject_id): subject_id
+                           for subject_id in subjects}
+                for future in as_completed(futures):
+                    subject_id = futures[future]
+                    try:
+                        results[subject_id] = future.result()
+                    except Exception as e:
+                        logger.error(f"Failed to convert subject {subject_id}: {e}")
+                        results[subject_id] = False
+            # Report in subject order regardless of completion order
+            results = {subject_id: results[subject_id] for subject_id in subjects}
+        else:
+            for subject_id in subjects:
+                try:
+                    results[subject_id] = self.convert_subject(subject_id)
+                except Exception as e:
+                    logger.error(f"Failed to convert subject {subject_id}: {e}")
+                    results[subject_id] = False
         
         # Summary
         successful = sum(results.values())
@@ -630,14 +1002,31 @@ def main():
     parser.add_argument('--subject', help='Convert only this subject (e.g., 027_S_6512)')
     parser.add_argument('--index-only', action='store_true', help='Only generate modality index, don\'t convert')
     parser.add_argument('--verbose', '-v', action='store_true', help='Enable verbose logging')
+    parser.add_argument('--force', action='store_true',
+                        help='Re-convert series whose BIDS output already exists')
+    parser.add_argument('--jobs', '-j', type=int, default=None,
+                        help='Number of subjects to convert in parallel (default: number of available CPUs)')
+    parser.add_argument('--series-jobs', type=int, default=None,
+                        help='Number of dcm2niix processes to run concurrently per session '
+                             '(default: available CPUs divided among the subject workers)')
+    parser.add_argument('--gz-mode', choices=['y', 'o', 'i', 'n'], default=None,
+                        help='dcm2niix compression: y=pigz, o=piped pigz, i=internal, n=none '
+                             '(default: o for a single serial conversion, otherwise i)')
     
     args = parser.parse_args()
     
     if args.verbose:
         logging.getLogger().setLevel(logging.DEBUG)
     
+    # Size worker pools from the CPUs actually allocated to this process; the
+    # converter splits them between subjects and series (see size_worker_pools)
+    # once it knows how many subject workers will run
+    jobs = args.jobs or _max_workers()
+    
     # Initialize converter
-    converter = ADNI2BIDSConverter(args.dicom_root, args.bids_output)
+    converter = ADNI2BIDSConverter(args.dicom_root, args.bids_output,
+                                   series_jobs=args.series_jobs or None, gz_mode=args.gz_mode,
+                                   force=args.force)
     
     if args.index_only:
         converter.generate_modality_index()
@@ -645,11 +1034,12 @@ def main():
     
     if args.subject:
         # Convert single subject
+        converter.size_worker_pools(1)
         success = converter.convert_subject(args.subject)
         exit(0 if success else 1)
     else:
         # Convert all subjects
-        results = converter.convert_all_subjects()
+        results = converter.convert_all_subjects(jobs=jobs)
         failed_count = sum(1 for success in results.values() if not success)
         exit(0 if failed_count == 0 else 1)
 
@@ -7,7 +7,21 @@ Provides overall modality counts and detailed anatomical modality breakdown.
 import os
 from pathlib import Path
 from collections import defaultdict, Counter
-import re
+from concurrent.futures import ProcessPoolExecutor
+
+_NIIGZ = '.nii.gz'
+_NIIGZ_LEN = len(_NIIGZ)
+
+def _max_workers():
+    """
+    Number of CPUs this process is allowed to run on.
+    
+    Unlike os.cpu_count(), this honours the affinity mask set by SLURM/LSF
+    job allocations, taskset and cgroup cpusets.
+    """
+    if hasattr(os, 'sched_getaffinity'):
+        return len(os.sched_getaffinity(0))
+    return os.cpu_count() or 1
 
 def count_modalities(bids_root):
     """Count modalities across the entire BIDS dataset."""
@@ -20,21 +34,15 @@ def count_modalities(bids_root):
     modality_counts = Counter()
     anat_specific_counts = Counter()
     
-    # Walk through all subject directories
-    for subject_dir in bids_path.glob("sub-*"):
-        if not subject_dir.is_dir():
-            continue
-            
-        # Walk through all session directories (if any)
-        session_dirs = list(subject_dir.glob("ses-*"))
-        if session_dirs:
-            # Dataset has sessions
-            for session_dir in session_dirs:
-                if session_dir.is_dir():
-                    count_modalities_in_directory(session_dir, modality_counts, anat_specific_counts)
-        else:
-            # No sessions, check modality folders directly under subject
-            count_modalities_in_directory(subject_dir, modality_counts, anat_specific_counts)
+    subject_dirs = [d for d in bids_path.glob("sub-*") if d.is_dir()]
+    
+    # Subjects are independent, so walk them in parallel and merge the counts.
+    # A handful of workers is enough; more just contend on the same directories.
+    max_workers = max(1, min(8, _max_workers(), len(subject_dirs)))
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        for subject_modalities, subject_anat in executor.map(_count_subject, subject_dirs, chunksize=16):
+            modality_counts.update(subject_modalities)
+            anat_specific_counts.update(subject_anat)
     
     # Print results
     print("="*60)
@@ -57,30 +65,82 @@ def count_modalities(bids_root):
             print(f"{anat_type:20}: {anat_specific_counts[anat_type]:6}")
         print(f"{'TOTAL anat':20}: {sum(anat_specific_counts.values()):6}")
 
-def count_modalities_in_directory(directory, modality_counts, anat_specific_counts):
-    """Count modalities in a specific directory (subject or session)."""
+def _walk_niigz(path):
+    """Yield DirEntry objects for all .nii.gz files below path."""
+    stack = [path]
+    while stack:
+        subdirs = []
+        with os.scandir(stack.pop()) as entries:
+            for entry in entries:
+                if entry.is_dir(follow_symlinks=False):
+                    subdirs.append(entry)
+                elif entry.name[-_NIIGZ_LEN:] == _NIIGZ:
+                    yield entry
+        # Descend in inode order (lowest popped first), which tracks on-disk
+        # layout better than readdir order; inode() needs no extra stat()
+        subdirs.sort(key=lambda e: e.inode(), reverse=True)
+        stack.extend(e.path for e in subdirs)
+
+def _count_subject(subject_dir):
+    """Count modalities for one subject, returning (modality_counts, anat_specific_counts)."""
+    modality_counts = Counter()
+    anat_specific_counts = Counter()
+    
+    # Walk through all session directories (if any)
+    session_dirs = list(subject_dir.glob("ses-*"))
+    if session_dirs:
+        # Dataset has sessions
+        directories = [d for d in session_dirs if d.is_dir()]
+    else:
+        # No sessions, check modality folders directly under subject
+        directories = [subject_dir]
+    
+    for directory in directories:
+        session_modalities, session_anat = count_modalities_in_directory(directory)
+        modality_counts.update(session_modalities)
+        anat_specific_counts.update(session_anat)
+    
+    return modality_counts, anat_specific_counts
+
+def count_modalities_in_directory(directory):
+    """
+    Count modalities in a specific directory (subject or session).
+    
+    Returns (modality_counts, anat_specific_counts) Counters.
+    """
+    modality_counts = Counter()
+    anat_specific_counts = Counter()
     
     # Check each modality folder
-    for modality_dir in directory.iterdir():
-        if not modality_dir.is_dir():
-            continue
-            
-        modality_name = modality_dir.name
-        
-        # Count files in this modality directory
-        file_count = 0
-        for file_path in modality_dir.rglob("*.nii.gz"):
-            file_count += 1
-            modality_counts[modality_name] += 1
+    with os.scandir(directory) as modality_dirs:
+        for modality_dir in modality_dirs:
+            if not modality_dir.is_dir():
+                continue
+                
+            modality_name = modality_dir.name
             
-            # For anatomical data, get more specific breakdown
+            # Count files in this modality directory, touching the shared
+            # Counters once per directory rather than once per file
+            n = 0
             if modality_name == "anat":
-                filename = file_path.name
-                # Extract modality from filename (e.g., T1w, T2w, FLAIR, etc.)
-                match = re.search(r'_([A-Za-z0-9]+)\.nii\.gz$', filename)
-                if match:
-                    anat_type = match.group(1)
-                    anat_specific_counts[anat_type] += 1
+                # For anatomical data, get more specific breakdown
+                local_anat = Counter()
+                for file_entry in _walk_niigz(modality_dir.path):
+                    n += 1
+                    # Extract modality from filename (e.g., T1w, T2w, FLAIR, etc.):
+                    # the part after the last underscore, minus ".nii.gz"
+                    _, sep, anat_type = file_entry.name[:-_NIIGZ_LEN].rpartition('_')
+                    if sep and anat_type.isascii() and anat_type.isalnum():
+                        local_anat[anat_type] += 1
+                anat_specific_counts.update(local_anat)
+            else:
+                for _ in _walk_niigz(modality_dir.path):
+                    n += 1
+            
+            if n:
+                modality_counts[modality_name] += n
+    
+    return modality_counts, anat_specific_counts
 
 if __name__ == "__main__":
     import argparse
@@ -2,68 +2,89 @@
 
 import pydicom
 import os
-import glob
+from concurrent.futures import ThreadPoolExecutor
+
+# The only tags we print; reading just these skips the pixel data entirely
+METADATA_TAGS = ['ProtocolName', 'SeriesDescription', 'SequenceName', 'PulseSequenceName']
+
+def read_dicom_metadata(dicom_path):
+    """Read Protocol Name, Series Description and sequence names from a DICOM file"""
+    ds = pydicom.dcmread(dicom_path, stop_before_pixels=True,
+                         specific_tags=METADATA_TAGS, defer_size='1 KB')
+    
+    return {
+        'protocol_name': ds.get('ProtocolName', 'Not found'),
+        'series_description': ds.get('SeriesDescription', 'Not found'),
+        # Additional useful metadata
+        'sequence_name': ds.get('SequenceName', 'Not found'),
+        'pulse_sequence_name': ds.get('PulseSequenceName', 'Not found')
+    }
+
+def print_dicom_metadata(dicom_path, description, metadata):
+    """Print metadata returned by read_dicom_metadata"""
+    print(f"\n=== {description} ===")
+    print(f"File: {dicom_path}")
+    print(f"ProtocolName: {metadata['protocol_name']}")
+    print(f"SeriesDescription: {metadata['series_description']}")
+    print(f"SequenceName: {metadata['sequence_name']}")
+    print(f"PulseSequenceName: {metadata['pulse_sequence_name']}")
 
 def extract_dicom_metadata(dicom_path, description):
     """Extract Protocol Name and Series Description from a DICOM file"""
     try:
-        ds = pydicom.dcmread(dicom_path)
-        
-        print(f"\n=== {description} ===")
-        print(f"File: {dicom_path}")
-        
-        # Extract Protocol Name
-        protocol_name = getattr(ds, 'ProtocolName', 'Not found')
-        print(f"ProtocolName: {protocol_name}")
-        
-        # Extract Series Description
-        series_description = getattr(ds, 'SeriesDescription', 'Not found')
-        print(f"SeriesDescription: {series_description}")
-        
-        # Additional useful metadata
-        sequence_name = getattr(ds, 'SequenceName', 'Not found')
-        print(f"SequenceName: {sequence_name}")
-        
-        pulse_sequence_name = getattr(ds, 'PulseSequenceName', 'Not found')
-        print(f"PulseSequenceName: {pulse_sequence_name}")
-        
-        return {
-            'protocol_name': protocol_name,
-            'series_description': series_description,
-            'sequence_name': sequence_name,
-            'pulse_sequence_name': pulse_sequence_name
-        }
-        
+        metadata = read_dicom_metadata(dicom_path)
     except Exception as e:
         print(f"Error reading {dicom_path}: {e}")
         return None
-
-def find_and_extract_dicom_metadata():
-    """Find DICOM files and extract metadata"""
     
+    print_dicom_metadata(dicom_path, description, metadata)
+    return metadata
+
+def first_dcm(root):
+    """Return the path of the first .dcm file found below root, or None"""
+    stack = [root]
+    while stack:
+        try:
+            entries = os.scandir(stack.pop())
+        except OSError:
+            continue
+        with entries:
+            for entry in entries:
+                if entry.name.endswith('.dcm'):
+                    return entry.path
+                if entry.is_dir(follow_symlinks=False):
+                    stack.append(entry.path)
+    return None
+
+# (series directory, description) pairs to probe
+SCANS = [
     # For fMRI
-    fmri_pattern = "dicom/002_S_0295/Resting_State_fMRI/**/*.dcm"
-    fmri_files = glob.glob(fmri_pattern, recursive=True)
-    if fmri_files:
-        extract_dicom_metadata(fmri_files[0], "fMRI - 002_S_0295")
-    
+    ("dicom/002_S_0295/Resting_State_fMRI", "fMRI - 002_S_0295"),
     # For Fieldmaps
-    fieldmap_pattern = "dicom/002_S_0295/Field_Mapping/**/*.dcm"
-    fieldmap_files = glob.glob(fieldmap_pattern, recursive=True)
-    if fieldmap_files:
-        extract_dicom_metadata(fieldmap_files[0], "Field Mapping - 002_S_0295")
-    
+    ("dicom/002_S_0295/Field_Mapping", "Field Mapping - 002_S_0295"),
     # For working subject (037_S_4432)
-    perfusion_pattern = "dicom/037_S_4432/Perfusion_Weighted/**/*.dcm"
-    perfusion_files = glob.glob(perfusion_pattern, recursive=True)
-    if perfusion_files:
-        extract_dicom_metadata(perfusion_files[0], "Perfusion Weighted - 037_S_4432")
-    
+    ("dicom/037_S_4432/Perfusion_Weighted", "Perfusion Weighted - 037_S_4432"),
     # Let's also check some other common scan types from 002_S_0295
-    mprage_pattern = "dicom/002_S_0295/MPRAGE/**/*.dcm"
-    mprage_files = glob.glob(mprage_pattern, recursive=True)
-    if mprage_files:
-        extract_dicom_metadata(mprage_files[0], "MPRAGE - 002_S_0295")
+    ("dicom/002_S_0295/MPRAGE", "MPRAGE - 002_S_0295"),
+]
+
+def find_and_extract_dicom_metadata():
+    """Find DICOM files and extract metadata"""
+    
+    tasks = [(first_dcm(series_dir), description) for series_dir, description in SCANS]
+    tasks = [(dicom_path, description) for dicom_path, description in tasks if dicom_path]
+    
+    # The reads are independent and I/O-bound, so overlap them; printing stays
+    # in this thread, in table order, so the output does not interleave
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        futures = [executor.submit(read_dicom_metadata, dicom_path) for dicom_path, _ in tasks]
+        for (dicom_path, description), future in zip(tasks, futures):
+            try:
+                metadata = future.result()
+            except Exception as e:
+                print(f"Error reading {dicom_path}: {e}")
+                continue
+            print_dicom_metadata(dicom_path, description, metadata)
 
 if __name__ == "__main__":
     find_and_extract_dicom_metadata()
\ No newline at end of file
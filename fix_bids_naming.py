@@ -4,19 +4,94 @@ Script to fix ADNI BIDS dataset naming conventions by converting
 letter suffixes (a, b, c) to proper BIDS numerical suffixes (_01, _02, _03)
 """
 
+import errno
 import json
 import os
 import shutil
-from pathlib import Path
-from collections import defaultdict
+import sys
+from collections import defaultdict, deque
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from functools import lru_cache
+from itertools import groupby
+from operator import attrgetter, itemgetter
+from types import MappingProxyType
+from typing import NamedTuple
 from tqdm import tqdm
 
+try:
+    # Optional: decodes large issues files several times faster than json
+    import orjson
+except ImportError:
+    orjson = None
+
+_NIIGZ = '.nii.gz'
+_NIIGZ_LEN = len(_NIIGZ)
+_JSON = '.json'
+
+# execute_renames keeps only this many error messages (but counts them all)
+MAX_KEPT_ERRORS = 100
+
+class RenameOp(NamedTuple):
+    """A single planned rename of a NIfTI or JSON sidecar file within directory"""
+    directory: str
+    old_filename: str
+    new_filename: str
+    subject: str
+    session: str
+    modality: str
+    base_name: str
+    old_suffix: str
+    new_suffix: str
+    
+    # Full paths are only needed for messages and fallbacks, so build them on
+    # demand instead of storing the directory prefix twice more per entry
+    @property
+    def old_path(self):
+        return os.path.join(self.directory, self.old_filename)
+    
+    @property
+    def new_path(self):
+        return os.path.join(self.directory, self.new_filename)
+
 def load_issues_data(json_file):
     """Load the issues data from the analysis script"""
-    with open(json_file, 'r') as f:
-        data = json.load(f)
+    if orjson is not None:
+        with open(json_file, 'rb') as f:
+            data = orjson.loads(f.read())
+    else:
+        with open(json_file, 'r') as f:
+            data = json.load(f)
     return data['issues'], data['stats']
 
+@lru_cache(maxsize=8192)
+def _dir_files(directory):
+    """
+    Return a read-only mapping of entry name -> inode for directory (empty if
+    it cannot be read). Cached, so call _dir_files.cache_clear() once the
+    directory may have changed.
+    """
+    try:
+        with os.scandir(directory or '.') as entries:
+            # inode() comes from the d_ino getdents already returned, no stat()
+            return MappingProxyType({entry.name: entry.inode() for entry in entries})
+    except OSError:
+        return MappingProxyType({})
+
+def _emit(rename_plan, directory, old_filename, new_filename, meta):
+    """
+    Append the rename of a .nii.gz file to rename_plan, followed by the rename
+    of its JSON sidecar if one exists. meta is the (subject, session, modality,
+    base_name, old_suffix, new_suffix) tuple shared by both operations.
+    """
+    # Interned so every op in the directory shares a single copy of the string
+    directory = sys.intern(directory)
+    rename_plan.append(RenameOp(directory, old_filename, new_filename, *meta))
+    
+    json_old_filename = old_filename[:-_NIIGZ_LEN] + _JSON
+    if json_old_filename in _dir_files(directory):
+        json_new_filename = new_filename[:-_NIIGZ_LEN] + _JSON
+        rename_plan.append(RenameOp(directory, json_old_filename, json_new_filename, *meta))
+
 def plan_renames(issues):
     """
     Plan all the renames needed, grouping files by base name and assigning
@@ -38,122 +113,127 @@ def plan_renames(issues):
                     sorted_files = sorted(file_list, key=lambda x: x['suffix'])
                     
                     # Check if base file (without suffix) exists in the same directory
-                    sample_path = Path(sorted_files[0]['full_path'])
-                    directory = sample_path.parent
-                    subject_session = sample_path.name.split('_T1w')[0] if 'T1w' in sample_path.name else sample_path.name.split(f'_{base_name}')[0]
-                    base_filename = f"{subject_session}_{base_name}.nii.gz"
-                    base_file_path = directory / base_filename
-                    base_file_exists = base_file_path.exists()
+                    directory = os.path.dirname(sorted_files[0]['full_path'])
+                    # Everything before the last "_<base_name>" is the sub-/ses- prefix
+                    subject_session = sorted_files[0]['filename'].rsplit(f'_{base_name}', 1)[0]
+                    base_filename = f"{subject_session}_{base_name}{_NIIGZ}"
+                    # One scandir per directory instead of a stat() per candidate file
+                    base_file_exists = base_filename in _dir_files(directory)
                     
                     # If base file exists, add it to rename plan as _01
                     if base_file_exists:
-                        base_new_filename = f"{subject_session}_{base_name}_01.nii.gz"
-                        base_new_path = str(directory / base_new_filename)
-                        
-                        rename_plan.append({
-                            'old_path': str(base_file_path),
-                            'new_path': base_new_path,
-                            'old_filename': base_filename,
-                            'new_filename': base_new_filename,
-                            'subject': subject_id,
-                            'session': session_id,
-                            'modality': modality,
-                            'base_name': base_name,
-                            'old_suffix': '',
-                            'new_suffix': '01'
-                        })
-                        
-                        # Add corresponding JSON file if it exists
-                        base_json_path = str(base_file_path).replace('.nii.gz', '.json')
-                        if os.path.exists(base_json_path):
-                            base_json_new_path = base_new_path.replace('.nii.gz', '.json')
-                            rename_plan.append({
-                                'old_path': base_json_path,
-                                'new_path': base_json_new_path,
-                                'old_filename': base_filename.replace('.nii.gz', '.json'),
-                                'new_filename': base_new_filename.replace('.nii.gz', '.json'),
-                                'subject': subject_id,
-                                'session': session_id,
-                                'modality': modality,
-                                'base_name': base_name,
-                                'old_suffix': '',
-                                'new_suffix': '01'
-                            })
+                        base_new_filename = f"{subject_session}_{base_name}_01{_NIIGZ}"
+                        meta = (subject_id, session_id, modality, base_name, '', '01')
+                        _emit(rename_plan, directory, base_filename, base_new_filename, meta)
                     
                     # Start numbering suffixed files from 02 if base exists, otherwise from 01
                     start_num = 2 if base_file_exists else 1
                     
                     for i, file_info in enumerate(sorted_files, start_num):
-                        old_path = file_info['full_path']
                         old_filename = file_info['filename']
                         
                         # Create new filename with proper numbering
                         # Replace the suffix (e.g., 'a') with proper number (e.g., '_01')
                         base_part = old_filename.replace(f"{base_name}{file_info['suffix']}", f"{base_name}")
-                        new_filename = base_part.replace(f"_{base_name}.nii.gz", f"_{base_name}_{i:02d}.nii.gz")
-                        
-                        new_path = str(Path(old_path).parent / new_filename)
-                        
-                        # Also plan rename for corresponding JSON file if it exists
-                        json_old_path = old_path.replace('.nii.gz', '.json')
-                        json_new_path = new_path.replace('.nii.gz', '.json')
-                        
-                        rename_plan.append({
-                            'old_path': old_path,
-                            'new_path': new_path,
-                            'old_filename': old_filename,
-                            'new_filename': new_filename,
-                            'subject': subject_id,
-                            'session': session_id,
-                            'modality': modality,
-                            'base_name': base_name,
-                            'old_suffix': file_info['suffix'],
-                            'new_suffix': f"{i:02d}"
-                        })
+                        new_filename = base_part.replace(f"_{base_name}{_NIIGZ}", f"_{base_name}_{i:02d}{_NIIGZ}")
                         
-                        # Add JSON file if it exists
-                        if os.path.exists(json_old_path):
-                            json_old_filename = os.path.basename(json_old_path)
-                            json_new_filename = os.path.basename(json_new_path)
-                            
-                            rename_plan.append({
-                                'old_path': json_old_path,
-                                'new_path': json_new_path,
-                                'old_filename': json_old_filename,
-                                'new_filename': json_new_filename,
-                                'subject': subject_id,
-                                'session': session_id,
-                                'modality': modality,
-                                'base_name': base_name,
-                                'old_suffix': file_info['suffix'],
-                                'new_suffix': f"{i:02d}"
-                            })
+                        meta = (subject_id, session_id, modality, base_name, file_info['suffix'], f"{i:02d}")
+                        _emit(rename_plan, os.path.dirname(file_info['full_path']), old_filename, new_filename, meta)
     
     return rename_plan
 
 def save_rename_plan(rename_plan, output_file):
     """Save the rename plan to a file for review"""
-    with open(output_file, 'w') as f:
+    with open(output_file, 'w', buffering=1 << 20) as f:
         f.write("BIDS Naming Fix Rename Plan\n")
         f.write("=" * 50 + "\n\n")
         f.write(f"Total files to rename: {len(rename_plan)}\n\n")
         
-        current_subject = None
-        current_session = None
-        
-        for item in rename_plan:
-            if item['subject'] != current_subject:
-                current_subject = item['subject']
-                f.write(f"\n{current_subject}:\n")
-            
-            if item['session'] != current_session:
-                current_session = item['session']
-                f.write(f"  {current_session}:\n")
-            
-            f.write(f"    {item['modality']}: {item['old_filename']} -> {item['new_filename']}\n")
-
-def execute_renames(rename_plan, dry_run=True):
-    """Execute the rename operations"""
+        # plan_renames already emits entries grouped by subject and session,
+        # so group consecutive runs rather than re-sorting the plan
+        for subject, subject_items in groupby(rename_plan, key=attrgetter('subject')):
+            f.write(f"\n{subject}:\n")
+            for session, session_items in groupby(subject_items, key=attrgetter('session')):
+                f.write(f"  {session}:\n")
+                f.write("".join(f"    {item.modality}: {item.old_filename} -> {item.new_filename}\n"
+                                for item in session_items))
+
+# renameat(2)/linkat(2) with directory fds skip re-resolving the directory path per file
+_RENAME_DIR_FD = all(func in os.supports_dir_fd for func in (os.rename, os.link, os.unlink))
+# link() must not follow a symlinked source (e.g. git-annex/DataLad datasets)
+_LINK_NOFOLLOW = os.link in os.supports_follow_symlinks
+
+def _do_rename(directory, old_filename, new_filename, dir_fd=None):
+    """
+    Rename a file within directory without replacing an existing target.
+    
+    os.rename silently replaces the target, so the new name is hard-linked
+    first (which fails with FileExistsError if it appeared after the pre-check)
+    and the old name unlinked afterwards. Filesystems without hard links fall
+    back to an existence check right before os.rename.
+    """
+    old_path = os.path.join(directory, old_filename)
+    new_path = os.path.join(directory, new_filename)
+    if dir_fd is None:
+        src, dst, fd_kwargs = old_path, new_path, {}
+    else:
+        src, dst, fd_kwargs = old_filename, new_filename, {'src_dir_fd': dir_fd, 'dst_dir_fd': dir_fd}
+    
+    if _LINK_NOFOLLOW:
+        try:
+            os.link(src, dst, follow_symlinks=False, **fd_kwargs)
+        except (FileExistsError, FileNotFoundError):
+            raise
+        except OSError:
+            pass  # No hard links here; use the checked rename below
+        else:
+            os.unlink(src, dir_fd=dir_fd)
+            return
+    
+    if os.path.lexists(new_path):
+        raise FileExistsError(errno.EEXIST, os.strerror(errno.EEXIST), new_path)
+    try:
+        os.rename(src, dst, **fd_kwargs)
+    except OSError as e:
+        if e.errno != errno.EXDEV:
+            raise
+        shutil.move(old_path, new_path)
+
+def _open_dir(directory):
+    """Open directory for use as a dir_fd, or return None if that is unavailable"""
+    if not _RENAME_DIR_FD:
+        return None
+    try:
+        return os.open(directory or '.', os.O_RDONLY | os.O_DIRECTORY)
+    except OSError:
+        return None
+
+def _rename_group(directory, items):
+    """
+    Rename items that live in the same directory, opening it once.
+    Returns a list of (item, exception or None).
+    """
+    results = []
+    dir_fd = _open_dir(directory)
+    try:
+        for item in items:
+            try:
+                _do_rename(directory, item.old_filename, item.new_filename, dir_fd)
+                results.append((item, None))
+            except Exception as e:
+                results.append((item, e))
+    finally:
+        if dir_fd is not None:
+            os.close(dir_fd)
+    return results
+
+def execute_renames(rename_plan, dry_run=True, max_workers=16):
+    """
+    Execute the rename operations.
+    
+    Returns (success_count, error_count, errors), where errors holds only the
+    last MAX_KEPT_ERRORS messages; error_count is the full total.
+    """
     
     if dry_run:
         print("DRY RUN MODE - No files will actually be renamed")
@@ -162,37 +242,85 @@ def execute_renames(rename_plan, dry_run=True):
     
     success_count = 0
     error_count = 0
-    errors = []
+    errors = deque(maxlen=MAX_KEPT_ERRORS)
+    
+    # Listings cached by plan_renames may predate the review prompt; a real run
+    # must check against the disk as it is now
+    if not dry_run:
+        _dir_files.cache_clear()
     
-    for item in tqdm(rename_plan, desc="Renaming files"):
-        old_path = item['old_path']
-        new_path = item['new_path']
+    # Check every operation up front against one listing per directory, and
+    # reject a second operation on an already claimed source or target. Since
+    # the renames then run concurrently, chains (a source that is an earlier
+    # target, or a target that an earlier rename frees up) are reported as
+    # errors rather than run in order; plan_renames never produces them.
+    pending = []
+    claimed_sources = set()
+    claimed_targets = set()
+    for item in rename_plan:
+        listing = _dir_files(item.directory)
+        old_key = (item.directory, item.old_filename)
+        new_key = (item.directory, item.new_filename)
         
-        if not os.path.exists(old_path):
-            error_msg = f"Source file does not exist: {old_path}"
+        if old_key in claimed_sources or item.old_filename not in listing:
+            error_msg = f"Source file does not exist: {item.old_path}"
             errors.append(error_msg)
             error_count += 1
             continue
         
-        if os.path.exists(new_path):
-            error_msg = f"Target file already exists: {new_path}"
+        if new_key in claimed_targets or item.new_filename in listing:
+            error_msg = f"Target file already exists: {item.new_path}"
             errors.append(error_msg)
             error_count += 1
             continue
         
-        if not dry_run:
-            try:
-                # Create directory if it doesn't exist
-                os.makedirs(os.path.dirname(new_path), exist_ok=True)
-                # Rename the file
-                shutil.move(old_path, new_path)
-                success_count += 1
-            except Exception as e:
-                error_msg = f"Error renaming {old_path} -> {new_path}: {str(e)}"
-                errors.append(error_msg)
-                error_count += 1
-        else:
-            success_count += 1
+        claimed_sources.add(old_key)
+        claimed_targets.add(new_key)
+        pending.append(item)
+    
+    if dry_run:
+        success_count += len(pending)
+        return success_count, error_count, errors
+    
+    # Targets sit next to their sources, so the directories already exist. Batch
+    # renames per directory so each batch opens it once and renames relative to
+    # that fd.
+    groups = defaultdict(list)
+    for item in pending:
+        groups[item.directory].append(item)
+    
+    # Visit directories in path order and files within each in inode order,
+    # which is close to on-disk order and keeps metadata access sequential
+    for directory, items in groups.items():
+        inodes = _dir_files(directory)
+        items.sort(key=lambda item: inodes.get(item.old_filename, 0))
+    
+    # Renames within a filesystem are single syscalls that release the GIL,
+    # so keep several batches in flight at once
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        futures = [executor.submit(_rename_group, directory, items)
+                   for directory, items in sorted(groups.items(), key=itemgetter(0))]
+        
+        with tqdm(total=len(pending), desc="Renaming files") as progress:
+            for future in as_completed(futures):
+                results = future.result()
+                for item, error in results:
+                    if error is None:
+                        success_count += 1
+                    else:
+                        # The disk changed since the pre-check
+                        if isinstance(error, FileExistsError):
+                            error_msg = f"Target file already exists: {item.new_path}"
+                        elif isinstance(error, FileNotFoundError):
+                            error_msg = f"Source file does not exist: {item.old_path}"
+                        else:
+                            error_msg = f"Error renaming {item.old_path} -> {item.new_path}: {str(error)}"
+                        errors.append(error_msg)
+                        error_count += 1
+                progress.update(len(results))
+    
+    # The cached listings no longer match the directories we just renamed in
+    _dir_files.cache_clear()
     
     return success_count, error_count, errors
 
@@ -234,11 +362,13 @@ def main():
         print(f"Errors: {errors} files")
         
         if error_list:
-            print("\nErrors encountered:")
-            for error in error_list[:10]:  # Show first 10 errors
+            # Only the most recent errors are kept, so show the last 10
+            if errors > 10:
+                print(f"\nErrors encountered (last 10 of {errors}):")
+            else:
+                print("\nErrors encountered:")
+            for error in list(error_list)[-10:]:
                 print(f"  - {error}")
-            if len(error_list) > 10:
-                print(f"  ... and {len(error_list) - 10} more errors")
     else:
         print("\nDry run mode - showing first 10 planned renames:")
         success, errors, error_list = execute_renames(rename_plan[:10], dry_run=True)